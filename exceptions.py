@@ -19,4 +19,13 @@ class TelegramChatIdException(Exception):
 class StatusCodeException(Exception):
     """StatusCodeException."""
 
+    def __init__(self, message, status_code=None, retry_after=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class EndpointRequestException(Exception):
+    """EndpointRequestException."""
+
     pass
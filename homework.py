@@ -1,13 +1,17 @@
 import os
+import random
 import sys
 import time
 import logging
+import math
 from http import HTTPStatus
+from types import MappingProxyType
 import requests
 import telegram
 from dotenv import load_dotenv
 from exceptions import TelegramTokenException, TelegramChatIdException
 from exceptions import PracticumTokenException, StatusCodeException
+from exceptions import EndpointRequestException
 
 
 load_dotenv()
@@ -18,22 +22,32 @@ VAR_NAME_TELEGRAM_CHAT_ID = 'TELEGRAM_CHAT_ID'
 PRACTICUM_TOKEN = os.getenv(VAR_NAME_PRACTICUM_TOKEN)
 TELEGRAM_TOKEN = os.getenv(VAR_NAME_TELEGRAM_TOKEN)
 TELEGRAM_CHAT_ID = os.getenv(VAR_NAME_TELEGRAM_CHAT_ID)
-TOKENS = [
-    (VAR_NAME_PRACTICUM_TOKEN, PRACTICUM_TOKEN, PracticumTokenException),
-    (VAR_NAME_TELEGRAM_TOKEN, TELEGRAM_TOKEN, TelegramTokenException),
-    (VAR_NAME_TELEGRAM_CHAT_ID, TELEGRAM_CHAT_ID, TelegramChatIdException),
-]
-FROM_DATE = 0
 RETRY_PERIOD = 600
+RETRY_BACKOFF_BASE = 30
+RETRY_BACKOFF_MAX = 3600
+RETRY_STATUS_CODES = (
+    HTTPStatus.TOO_MANY_REQUESTS,
+    HTTPStatus.INTERNAL_SERVER_ERROR,
+    HTTPStatus.BAD_GATEWAY,
+    HTTPStatus.SERVICE_UNAVAILABLE,
+    HTTPStatus.GATEWAY_TIMEOUT,
+)
+CONGESTION_SMOOTHING = 0.3
 ENDPOINT = 'https://practicum.yandex.ru/api/user_api/homework_statuses/'
-HEADERS = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
+REQUEST_TIMEOUT = (5, 30)
+HEADERS = MappingProxyType({'Authorization': f'OAuth {PRACTICUM_TOKEN}'})
 
 
-HOMEWORK_VERDICTS = {
+HOMEWORK_VERDICTS = MappingProxyType({
     'approved': 'Работа проверена: ревьюеру всё понравилось. Ура!',
     'reviewing': 'Работа взята на проверку ревьюером.',
     'rejected': 'Работа проверена: у ревьюера есть замечания.'
-}
+})
+_STATUS_TEMPLATE = ('Изменился статус проверки работы '
+                    '"{name}". {verdict}').format
+_TOKEN_MISSING_TEMPLATE = ('Отсутствует обязательная переменная '
+                           'окружения: {var_name} '
+                           'Программа принудительно остановлена.').format
 
 
 def start_logging() -> logging.Logger:
@@ -52,117 +66,150 @@ logger = start_logging()
 logger.info("Start logging")
 
 
-def check_tokens_additional() -> None:
-    """Check variables availability."""
-    info = ('Отсутствует обязательная переменная '
-            'окружения: {var_name} '
-            'Программа принудительно остановлена.')
-    for var_name, token, exception in TOKENS:
-        if token is None:
-            logger.critical(info.format(var_name=var_name))
-            raise exception(
-                info.format(var_name=var_name)
-            )
-
-
 def check_tokens() -> None:
     """Check variables availability."""
-    info = ('Отсутствует обязательная переменная '
-            'окружения: {var_name} '
-            'Программа принудительно остановлена.')
-
-    if PRACTICUM_TOKEN is None:
-        logger.critical(info.format(var_name=VAR_NAME_PRACTICUM_TOKEN))
-        raise PracticumTokenException(
-            info.format(var_name=VAR_NAME_PRACTICUM_TOKEN)
-        )
-    if TELEGRAM_TOKEN is None:
-        logger.critical(info.format(var_name=VAR_NAME_TELEGRAM_TOKEN))
-        raise TelegramTokenException(
-            info.format(var_name=VAR_NAME_TELEGRAM_TOKEN)
-        )
-    if TELEGRAM_CHAT_ID is None:
-        logger.critical(info.format(var_name=VAR_NAME_TELEGRAM_CHAT_ID))
-        raise TelegramChatIdException(
-            info.format(var_name=VAR_NAME_TELEGRAM_CHAT_ID)
-        )
+    if all((PRACTICUM_TOKEN, TELEGRAM_TOKEN, TELEGRAM_CHAT_ID)):
+        return
+    tokens = (
+        (VAR_NAME_PRACTICUM_TOKEN, PRACTICUM_TOKEN, PracticumTokenException),
+        (VAR_NAME_TELEGRAM_TOKEN, TELEGRAM_TOKEN, TelegramTokenException),
+        (VAR_NAME_TELEGRAM_CHAT_ID, TELEGRAM_CHAT_ID, TelegramChatIdException),
+    )
+    for var_name, token, exception in tokens:
+        if not token:
+            info = _TOKEN_MISSING_TEMPLATE(var_name=var_name)
+            logger.critical(info)
+            raise exception(info)
 
 
 def send_message(bot: telegram.Bot, message: str) -> None:
     """Send message in Telegram."""
     try:
-        bot.send_message(chat_id=TELEGRAM_CHAT_ID, text=message)
-        logger.debug(f'Бот отправил сообщение {message}')
+        try:
+            bot.send_message(chat_id=TELEGRAM_CHAT_ID, text=message)
+        except telegram.error.RetryAfter as error:
+            logger.warning('Бот: превышен лимит Telegram, повторная '
+                           'отправка через %s с', error.retry_after)
+            time.sleep(error.retry_after)
+            bot.send_message(chat_id=TELEGRAM_CHAT_ID, text=message)
+        logger.debug('Бот отправил сообщение %s', message)
     except Exception as error:
-        logger.error('Бот: не удалось отправить '
-                     f'сообщение {message}. {error}')
+        logger.error('Бот: не удалось отправить сообщение %s. %s',
+                     message, error)
 
 
-def get_api_answer(timestamp: int) -> dict or None:
+def get_api_answer(timestamp: int) -> dict:
     """Get homework statuses."""
     try:
         homework_statuses = requests.get(url=ENDPOINT,
                                          headers=HEADERS,
-                                         params={'from_date': timestamp})
+                                         params={'from_date': timestamp},
+                                         timeout=REQUEST_TIMEOUT)
         status_code = homework_statuses.status_code
         if status_code != HTTPStatus.OK:
             info = (f'Эндпоинт {ENDPOINT} недоступен. '
                     f'Код ответа API: {status_code}')
-            raise StatusCodeException(info)
+            retry_after = None
+            if status_code == HTTPStatus.TOO_MANY_REQUESTS:
+                retry_after = homework_statuses.headers.get('Retry-After')
+                if retry_after is not None and retry_after.isdigit():
+                    retry_after = int(retry_after)
+                else:
+                    retry_after = None
+            raise StatusCodeException(info, status_code, retry_after)
         return homework_statuses.json()
     except requests.RequestException as error:
-        logger.error(error)
+        raise EndpointRequestException(
+            f'Ошибка при запросе к эндпоинту {ENDPOINT}: {error}'
+        ) from error
 
 
 def check_response(response: dict) -> dict or None:
     """Check API response."""
     if not isinstance(response, dict):
         raise TypeError('type(response) is not dict')
-    if response.get('code') == 'not_authenticated':
+    code = response.get('code')
+    homeworks = response.get('homeworks')
+    if code == 'not_authenticated':
         raise TypeError(response.get('message'))
-    if response.get('code') == 'UnknownError':
+    if code == 'UnknownError':
         raise TypeError(response.get('error'))
-    if not isinstance(response.get('homeworks'), list):
+    if not isinstance(homeworks, list):
         raise TypeError('type(response.get(\'homeworks\')) is not list')
-    if len(response.get('homeworks')) == 0:
-        raise IndexError('len(response.get(\'homeworks\')) == 0')
-    return response.get('homeworks')[0]
+    return homeworks[0] if homeworks else None
 
 
 def parse_status(homework: dict) -> str:
     """Parse response status."""
     if 'homework_name' not in homework:
         raise IndexError('No key \'homework_name\' in homework')
-    if 'status' not in homework:
-        raise IndexError('No such key "status" in homework')
-    if not homework['status'] in HOMEWORK_VERDICTS:
-        raise IndexError('No such key homework[status] '
-                         'in HOMEWORK_VERDICTS')
+    status = homework.get('status')
+    verdict = HOMEWORK_VERDICTS.get(status)
+    if verdict is None:
+        raise IndexError(f'Unknown homework status: {status!r}')
     homework_name = homework['homework_name']
-    verdict = HOMEWORK_VERDICTS[homework['status']]
-    return ('Изменился статус проверки работы '
-            f'"{homework_name}". {verdict}')
+    return _STATUS_TEMPLATE(name=homework_name, verdict=verdict)
+
+
+def get_retry_delay(fail_count: int, congestion: float,
+                    retry_after: int or None = None) -> float:
+    """Get pause before the next API request."""
+    if retry_after is not None:
+        return min(retry_after, RETRY_BACKOFF_MAX)
+    if fail_count == 0:
+        return RETRY_PERIOD
+    delay = RETRY_BACKOFF_BASE * 2 ** min(fail_count, 6) * (1 + congestion)
+    return min(delay * random.uniform(0.9, 1.1), RETRY_BACKOFF_MAX)
 
 
 def main() -> None:
     """Основная логика работы бота."""
     check_tokens()
     bot = telegram.Bot(token=TELEGRAM_TOKEN)
+    timestamp = int(time.time())
     message = None
+    fail_count = 0
+    congestion = 0.0
+    next_tick = time.monotonic()
 
     while True:
+        new_message = message
+        status_code = HTTPStatus.OK
+        retry_after = None
+        transient = False
         try:
-            api_answer = get_api_answer(timestamp=FROM_DATE)
+            api_answer = get_api_answer(timestamp=timestamp)
             homework = check_response(api_answer)
-            new_message = parse_status(homework)
+            if homework is None:
+                logger.debug('Новых статусов нет')
+            else:
+                new_message = parse_status(homework)
+            timestamp = api_answer.get('current_date', timestamp)
         except Exception as error:
             new_message = f'Сбой в работе программы: {error}'
             logger.error(new_message)
+            status_code = getattr(error, 'status_code', None)
+            retry_after = getattr(error, 'retry_after', None)
+            transient = (isinstance(error, EndpointRequestException)
+                         or status_code in RETRY_STATUS_CODES)
         finally:
             if new_message != message:
                 message = new_message
                 send_message(bot=bot, message=message)
-            time.sleep(RETRY_PERIOD)
+            if transient:
+                fail_count += 1
+            else:
+                fail_count = 0
+            throttled = status_code == HTTPStatus.TOO_MANY_REQUESTS
+            congestion += CONGESTION_SMOOTHING * (throttled - congestion)
+            delay = get_retry_delay(fail_count, congestion, retry_after)
+            now = time.monotonic()
+            if fail_count:
+                next_tick = now + delay
+            else:
+                next_tick = max(next_tick + delay, now)
+            pause = math.ceil(next_tick - now)
+            time.sleep(pause)
 
 
 if __name__ == '__main__':
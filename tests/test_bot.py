@@ -1,6 +1,7 @@
 import inspect
 import logging
 import platform
+import random
 import re
 import time
 from http import HTTPStatus
@@ -9,6 +10,7 @@ import pytest
 import requests
 import telegram
 
+import exceptions
 import utils
 
 old_sleep = time.sleep
@@ -279,6 +281,80 @@ class TestHomework:
         except Exception:
             pass
 
+    def test_get_retry_delay(self, homework_module):
+        func_name = 'get_retry_delay'
+        assert hasattr(homework_module, func_name), (
+            f'Не найдена функция `{func_name}`.'
+        )
+        get_retry_delay = homework_module.get_retry_delay
+        assert get_retry_delay(0, 0.0) == self.RETRY_PERIOD, (
+            'Убедитесь, что после успешного запроса следующий запрос '
+            'отправляется через `RETRY_PERIOD`.'
+        )
+        assert get_retry_delay(1, 0.0, retry_after=42) == 42, (
+            'Убедитесь, что пауза берётся из заголовка `Retry-After`, '
+            'если API домашки его вернул.'
+        )
+        delays = [get_retry_delay(count, 0.0) for count in range(1, 4)]
+        assert delays == sorted(delays), (
+            'Убедитесь, что пауза растёт с количеством неудачных запросов.'
+        )
+        assert (
+            get_retry_delay(100, 1.0) <= homework_module.RETRY_BACKOFF_MAX
+        ), (
+            'Убедитесь, что пауза не превышает `RETRY_BACKOFF_MAX`.'
+        )
+        assert (
+            get_retry_delay(1, 0.0, retry_after=999999999)
+            == homework_module.RETRY_BACKOFF_MAX
+        ), (
+            'Убедитесь, что пауза из `Retry-After` не превышает '
+            '`RETRY_BACKOFF_MAX`.'
+        )
+
+    @pytest.mark.parametrize('http_status, headers, retry_after', [
+        (HTTPStatus.TOO_MANY_REQUESTS, {'Retry-After': '120'}, 120),
+        (HTTPStatus.TOO_MANY_REQUESTS,
+         {'Retry-After': 'Wed, 21 Oct 2015 07:28:00 GMT'}, None),
+        (HTTPStatus.TOO_MANY_REQUESTS, {}, None),
+        (HTTPStatus.SERVICE_UNAVAILABLE, {'Retry-After': '120'}, None),
+    ])
+    def test_get_api_answer_retry_after(self, monkeypatch, current_timestamp,
+                                        http_status, headers, retry_after,
+                                        homework_module):
+        monkeypatch.setattr(
+            requests,
+            'get',
+            lambda *args, **kwargs: utils.MockResponseGET(
+                http_status=http_status, data={}, headers=headers
+            )
+        )
+        with pytest.raises(exceptions.StatusCodeException) as error:
+            homework_module.get_api_answer(current_timestamp)
+        assert error.value.status_code == http_status, (
+            'Убедитесь, что исключение хранит код ответа API домашки.'
+        )
+        assert error.value.retry_after == retry_after, (
+            'Убедитесь, что `Retry-After` учитывается только для ответа 429 '
+            'с числом секунд в заголовке.'
+        )
+
+    def test_get_api_answer_wraps_request_exception(self, monkeypatch,
+                                                    current_timestamp,
+                                                    homework_module):
+        request_error = requests.ConnectionError('Something wrong')
+
+        def mock_request_get_with_exception(*args, **kwargs):
+            raise request_error
+
+        monkeypatch.setattr(requests, 'get', mock_request_get_with_exception)
+        with pytest.raises(exceptions.EndpointRequestException) as error:
+            homework_module.get_api_answer(current_timestamp)
+        assert error.value.__cause__ is request_error, (
+            'Убедитесь, что исходное исключение `requests` сохраняется '
+            'в `__cause__`.'
+        )
+
     def test_parse_status_with_expected_statuses(self, homework_module):
         func_name = 'parse_status'
         utils.check_function(
@@ -491,6 +567,36 @@ class TestHomework:
                 'метод бота `send_message`.'
             )
 
+    def test_send_message_retry_after(self, monkeypatch, random_message,
+                                      caplog, homework_module):
+        monkeypatch.setattr(homework_module, 'TELEGRAM_CHAT_ID', '12345')
+        bot = get_mock_telegram_bot(monkeypatch, random_message)
+        send_message = bot.send_message
+        calls = []
+
+        def send_message_with_flood_control(*args, **kwargs):
+            calls.append(kwargs)
+            if len(calls) == 1:
+                raise telegram.error.RetryAfter(0)
+            send_message(*args, **kwargs)
+
+        monkeypatch.setattr(bot, 'send_message',
+                            send_message_with_flood_control)
+
+        with utils.check_logging(caplog, level=logging.DEBUG, message=(
+                'Убедитесь, что сообщение отправляется повторно после '
+                'ошибки `RetryAfter`.'
+        )):
+            homework_module.send_message(bot, 'Test_message_check')
+        assert len(calls) == 2, (
+            'Убедитесь, что при ошибке `RetryAfter` сообщение '
+            'отправляется повторно.'
+        )
+        assert bot.is_message_sent, (
+            'Убедитесь, что при ошибке `RetryAfter` сообщение '
+            'в итоге отправлено.'
+        )
+
     def test_bot_initialized_in_main(self, homework_module):
         func_name = 'main'
         utils.check_function(
@@ -590,6 +696,53 @@ class TestHomework:
         if platform.system() != 'Windows':
             homework_module.main = utils.with_timeout(homework_module.main)
 
+    def run_main_loop(self, monkeypatch, homework_module, responses,
+                      request_time=0):
+        """
+        Run main() for one iteration per response and collect request
+        params, sleep durations and messages sent to Telegram.
+        A response may be an exception to raise from `requests.get`.
+        `time.monotonic` follows a fake clock advanced by every sleep and
+        by `request_time` seconds per request.
+        """
+        monkeypatch.setattr(homework_module, 'PRACTICUM_TOKEN', 'sometoken')
+        monkeypatch.setattr(homework_module, 'TELEGRAM_TOKEN', '1234:abcdefg')
+        monkeypatch.setattr(homework_module, 'TELEGRAM_CHAT_ID', '12345')
+        iterations = len(responses)
+        responses = iter(responses)
+        request_params, sleeps, messages = [], [], []
+        clock = [0.0]
+
+        def mock_monotonic():
+            return clock[0]
+
+        def mock_request_get(*args, **kwargs):
+            request_params.append(kwargs['params'])
+            clock[0] += request_time
+            response = next(responses)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        def mock_sleep(secs):
+            sleeps.append(secs)
+            clock[0] += secs
+            if len(sleeps) == iterations:
+                raise utils.BreakInfiniteLoop('break')
+
+        def mock_send_message(bot, message=''):
+            messages.append(message)
+
+        monkeypatch.setattr(requests, 'get', mock_request_get)
+        monkeypatch.setattr(time, 'sleep', mock_sleep)
+        monkeypatch.setattr(time, 'monotonic', mock_monotonic)
+        monkeypatch.setattr(telegram, 'Bot', utils.MockTelegramBot)
+        monkeypatch.setattr(homework_module, 'send_message',
+                            mock_send_message)
+        with pytest.raises(utils.BreakInfiniteLoop):
+            homework_module.main()
+        return request_params, sleeps, messages
+
     def test_main_without_env_vars_raise_exception(
             self, caplog, monkeypatch, random_timestamp, current_timestamp,
             random_message, homework_module
@@ -772,6 +925,96 @@ class TestHomework:
                     'возникновении ошибки отправки сообщения в Телеграм.'
                 ) from e
 
+    def test_main_advances_from_date(self, monkeypatch, random_timestamp,
+                                     current_timestamp, homework_module):
+        empty_response = {'homeworks': [], 'current_date': random_timestamp}
+        assert homework_module.check_response(empty_response) is None, (
+            'Убедитесь, что функция `check_response` возвращает `None`, '
+            'если новых домашних работ нет.'
+        )
+        request_params, _, messages = self.run_main_loop(
+            monkeypatch,
+            homework_module,
+            [
+                utils.MockResponseGET(random_timestamp=random_timestamp),
+                utils.MockResponseGET(random_timestamp=random_timestamp),
+            ]
+        )
+        assert int(request_params[0]['from_date']) >= current_timestamp, (
+            'Убедитесь, что первый запрос к API домашки отправляется '
+            'с текущей временной меткой.'
+        )
+        assert request_params[1]['from_date'] == random_timestamp, (
+            'Убедитесь, что следующий запрос к API домашки отправляется '
+            'с `current_date` из предыдущего ответа.'
+        )
+        assert not messages, (
+            'Убедитесь, что при отсутствии новых статусов сообщение '
+            'в Telegram не отправляется.'
+        )
+
+    def test_main_waits_full_retry_after(self, monkeypatch,
+                                         random_timestamp, homework_module):
+        _, sleeps, _ = self.run_main_loop(
+            monkeypatch,
+            homework_module,
+            [
+                utils.MockResponseGET(
+                    random_timestamp=random_timestamp,
+                    http_status=HTTPStatus.TOO_MANY_REQUESTS,
+                    data={},
+                    headers={'Retry-After': '7'}
+                ),
+            ],
+            request_time=0.7
+        )
+        assert sleeps == [7], (
+            'Убедитесь, что пауза после ответа 429 отсчитывается от момента '
+            'получения ответа и не короче `Retry-After`.'
+        )
+
+    def test_main_backs_off_on_server_error(self, monkeypatch,
+                                            random_timestamp,
+                                            homework_module):
+        monkeypatch.setattr(random, 'uniform', lambda a, b: 1.0)
+        _, sleeps, _ = self.run_main_loop(
+            monkeypatch,
+            homework_module,
+            [
+                utils.MockResponseGET(
+                    random_timestamp=random_timestamp,
+                    http_status=HTTPStatus.INTERNAL_SERVER_ERROR,
+                    data={}
+                ),
+                utils.MockResponseGET(random_timestamp=random_timestamp),
+            ]
+        )
+        assert sleeps == [
+            homework_module.RETRY_BACKOFF_BASE * 2, self.RETRY_PERIOD
+        ], (
+            'Убедитесь, что после ответа 5xx повторный запрос отправляется '
+            'с экспоненциальной задержкой, а после успешного ответа '
+            'через `RETRY_PERIOD`.'
+        )
+
+    def test_main_backs_off_on_request_exception(self, monkeypatch,
+                                                 homework_module):
+        monkeypatch.setattr(random, 'uniform', lambda a, b: 1.0)
+        _, sleeps, messages = self.run_main_loop(
+            monkeypatch,
+            homework_module,
+            [requests.ConnectionError('Something wrong')]
+        )
+        assert sleeps == [homework_module.RETRY_BACKOFF_BASE * 2], (
+            'Убедитесь, что после ошибки запроса к API домашки повторный '
+            'запрос отправляется с короткой задержкой, а не через '
+            '`RETRY_PERIOD`.'
+        )
+        assert messages, (
+            'Убедитесь, что об ошибке запроса к API домашки бот сообщает '
+            'в Telegram.'
+        )
+
     def test_docstrings(self, homework_module):
         for func in self.HOMEWORK_FUNC_WITH_PARAMS_QTY:
             utils.check_docstring(homework_module, func)
@@ -84,9 +84,11 @@ class MockResponseGET:
     CALLED_LOG_MSG = 'Request is sent'
 
     def __init__(self, *args, random_timestamp=None,
-                 http_status=HTTPStatus.OK, data=None, **kwargs):
+                 http_status=HTTPStatus.OK, data=None, headers=None,
+                 **kwargs):
         self.random_timestamp = random_timestamp
         self.status_code = http_status
+        self.headers = {} if headers is None else headers
         self.reason = ''
         self.text = ''
         default_data = {